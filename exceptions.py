@@ -1,7 +1,7 @@
 __all__ = (
     "SRPNException", "InvalidInput", "ModulusByZero", "StackException",
     "StackOverflow", "StackUnderflow", "StackEmpty", "OperatorException",
-    "NegativePower", "DivideByZero", "ModulusByZero"
+    "NegativePower", "DivideByZero", "ModulusByZero", "InvalidDefinition"
 )
 
 
@@ -19,6 +19,13 @@ class InvalidInput(SRPNException):
         super().__init__(message)
 
 
+class InvalidDefinition(SRPNException):
+    """Exception raised when a user-defined word is not written as `: name body ;`, or has an unusable name."""
+    def __init__(self, name: str = '') -> None:
+        message = f'Invalid word definition "{name}".'
+        super().__init__(message)
+
+
 class StackException(SRPNException):
     """A base class for exceptions which occur within the `Stack` class."""
     pass
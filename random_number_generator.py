@@ -36,6 +36,16 @@ class RandomNumberGenerator:
         self._index = (self._index + 1) % len(self._random_values)
         return value
 
+    @property
+    def index(self) -> int:
+        """Returns the index of the next value the generator will yield."""
+        return self._index
+
+    @index.setter
+    def index(self, i: int) -> None:
+        """Moves the generator to the given index, wrapping around the set of pre-determined integers."""
+        self._index = i % len(self._random_values)
+
     def __iter__(self) -> RandomNumberGenerator:
         """This method is implemented so you can use this class like an Iterator."""
         return self
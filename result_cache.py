@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import collections
+import typing
+
+from clamped_int import ClampedInt
+
+
+class CalculatorState(typing.NamedTuple):
+    """A snapshot of the parts of the calculator that a line of input read or changed.
+    Values in the stack below `depth` are left out, as the line never touched them.
+    """
+    depth: int
+    stack: typing.Tuple[ClampedInt, ...]  # The values above `depth`, from bottom to top.
+    rng_index: int
+    is_commenting: bool
+
+
+class CachedResult(typing.NamedTuple):
+    """The outcome of processing a line of input: the state it was processed from, the state it left the calculator
+    in and everything it printed. `stack_hash` is the hash of the values in the stack the line started from.
+    """
+    line: str
+    before: CalculatorState
+    stack_hash: int
+    after: CalculatorState
+    output: str
+
+
+class ResultCache:
+    """
+    A bounded cache holding the results of processing lines of input.
+    Results are keyed by a hash of the line and the calculator state it was processed from. As a hash alone could
+    collide, callers must verify a result's `before` state before using it. Once full, the least recently used result
+    is evicted.
+
+    Parameters
+    ----------
+    max_entries: Optional[int]
+        The maximum number of results to hold. Defaults to 1024.
+    """
+    def __init__(self, max_entries: int = 1024) -> None:
+        if max_entries < 1:
+            raise ValueError('A result cache must be able to hold at least one entry.')
+
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()  # key -> result, least recently used first.
+
+    def __len__(self) -> int:
+        """Returns the number of results currently held."""
+        return len(self._entries)
+
+    def get(self, key: int, line: str) -> typing.Optional[CachedResult]:
+        """Returns the result stored for this key and line, or None if there isn't one."""
+        result = self._entries.get(key)
+        if result is None or result.line != line:  # Missing, or a different line with the same hash.
+            return None
+
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: int, result: CachedResult) -> None:
+        """Stores the result under the given key, evicting the oldest result if full."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all stored results."""
+        self._entries.clear()
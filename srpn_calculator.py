@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import contextlib
+import io
+import sys
+
 from clamped_int import ClampedInt
 from exceptions import (
     SRPNException,
+    InvalidDefinition,
     InvalidInput,
     StackException,
     OperatorException,
     StackOverflow
 )
 from random_number_generator import RandomNumberGenerator
-from stack import ClampedIntStack, OperatorStack, StringStack
+from result_cache import CachedResult, CalculatorState, ResultCache
+from stack import ClampedIntStack, HashedClampedIntStack, OperatorStack, StringStack
 from user_input import UserInput
 from utility import is_digit, operator_map
+from words import DISPLAY, OPERATE, PRINT, PUSH, RANDOM, Word
 
 
 class SRPNCalculator:
     """
     A class used to represent the command line saturated reverse polish notation (SRPN) calculator.
     When running, the class will wait for user input via the command line and process it accordingly.
+    A line of the form `: name body ;` defines a word, which can then be used in later input in place of its body.
 
     Parameters
     ----------
@@ -25,18 +33,35 @@ class SRPNCalculator:
         The maximum number of elements the `Stack` can hold.
     rng_index: Optional[int]
         The index to start the `RandomNumberGenerator` on. Defaults to 0 (the start).
+    memo_size: Optional[int]
+        The maximum number of line results to memoize. When a line is entered again from the exact same state, its
+        stored result is replayed instead of processing it again. Defaults to 0 (memoization disabled).
     """
-    def __init__(self, max_stack_size: int = None, rng_index: int = 0) -> None:
-        self._stack = ClampedIntStack(max_size=max_stack_size)
+    def __init__(self, max_stack_size: int = None, rng_index: int = 0, memo_size: int = 0) -> None:
+        # Only memoization needs the stack state hash, so don't pay for maintaining it otherwise.
+        self._stack = (HashedClampedIntStack if memo_size else ClampedIntStack)(max_size=max_stack_size)
         self._operator_stack = OperatorStack()
         self._rng = RandomNumberGenerator(index=rng_index)
         self._is_commenting = False  # Bool as to whether or not the user is currently writing comments using a '#'.
+        self._result_cache = ResultCache(max_entries=memo_size) if memo_size else None
+        self._words = {}  # User-defined words, by name.
         print('You can now start interacting with the SRPN calculator')
 
     def __call__(self, string_input: str) -> None:
         """Called and handles the raw string input from command line."""
+        # Only split up lines which could be definitions, to keep this cheap for every other line.
+        if (not self._is_commenting and string_input.lstrip().startswith(':')
+                and string_input.split(maxsplit=1)[0] == ':'):
+            self._define_word(string_input)
+        elif self._result_cache is None:
+            self._process_line(string_input)
+        else:
+            self._process_line_memoized(string_input)
+
+    def _process_line(self, string_input: str) -> None:
+        """Parses and processes a single line of raw string input."""
         try:
-            user_input = UserInput(string_input)
+            user_input = UserInput(string_input, words=self._words)
             # We need to split the raw string up into elements. Group numbers >9 together and clean up white space.
             parsed_input = user_input.get_parsed_input()
             # Process the input now it is nicely split up.
@@ -44,12 +69,83 @@ class SRPNCalculator:
         except SRPNException as e:  # Something unexpected has happened if the program reaches here.
             raise e
 
+    def _define_word(self, string_input: str) -> None:
+        """Compiles and stores a word from a line of the form `: name body ;`."""
+        tokens = string_input.split()
+        try:
+            if len(tokens) < 3 or tokens[-1] != ';':
+                raise InvalidDefinition(tokens[1] if len(tokens) > 1 else '')
+
+            name = tokens[1]
+            # The body is taken from the raw string, as white space between elements can affect when operators run.
+            body_start = string_input.index(name, string_input.index(':') + 1) + len(name)
+            body = string_input[body_start:string_input.rindex(';')].strip()
+            self._words[name] = Word(name, body, words=self._words)
+        except (InvalidDefinition, InvalidInput) as e:
+            # A bad definition is a user error, so shouldn't crash the program. Make the user aware instead.
+            print(e)
+            return
+
+        if self._result_cache is not None:  # Stored results may have been for lines which used the old definition.
+            self._result_cache.clear()
+
+    def _process_line_memoized(self, string_input: str) -> None:
+        """Same as `_process_line`, but replays the stored result if this line has been processed from this state.
+        Only the part of the stack the line touched counts as its state, so checking for and replaying a stored result
+        costs as much as the line touched, rather than the whole stack.
+        Operators left over from a failed operator chain are not part of the memoized state, so any line started or
+        finished with them pending is processed as normal and not stored.
+        """
+        if len(self._operator_stack) > 0:
+            self._process_line(string_input)
+            return
+
+        stack = self._stack
+        key = hash((string_input, stack.count, self._rng.index, self._is_commenting))
+        result = self._result_cache.get(key, string_input)
+        if result is not None and self._is_in_state(result.before, result.stack_hash):
+            stack.truncate(result.before.depth)
+            for value in result.after.stack:
+                stack.push_unchecked(value)
+            self._rng.index = result.after.rng_index
+            self._is_commenting = result.after.is_commenting
+            sys.stdout.write(result.output)
+            return
+
+        rng_index = self._rng.index
+        is_commenting = self._is_commenting
+        stack.mark()
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                self._process_line(string_input)
+        finally:  # Whatever happens, the user should still see what was printed.
+            sys.stdout.write(output.getvalue())
+
+        if len(self._operator_stack) == 0:
+            depth = stack.low_water
+            before = CalculatorState(depth, stack.touched, rng_index, is_commenting)
+            after = CalculatorState(depth, stack.suffix(depth), self._rng.index, self._is_commenting)
+            result = CachedResult(string_input, before, stack.touched_hash, after, output.getvalue())
+            self._result_cache.put(key, result)
+
+    def _is_in_state(self, state: CalculatorState, stack_hash: int) -> bool:
+        """Returns True if the calculator is in the given state. Values in the stack below its depth are ignored."""
+        stack = self._stack
+        return (self._rng.index == state.rng_index and self._is_commenting == state.is_commenting
+                and stack.count == state.depth + len(state.stack)
+                and stack.suffix_hash(state.depth) == stack_hash and stack.suffix(state.depth) == state.stack)
+
     def reset(self) -> None:
         """Resets any instance variables."""
         self._rng.reset()
         self._stack.clear()
         self._operator_stack.clear()
         self._is_commenting = False
+        # Results are keyed by the state they depend on, so only those which may have used the cleared words are stale.
+        if self._words and self._result_cache is not None:
+            self._result_cache.clear()
+        self._words.clear()
         return
 
     def _process_parsed_string(self, parsed_string: StringStack) -> None:
@@ -57,6 +153,7 @@ class SRPNCalculator:
         previous_string = ' '
         current_string = ' '
         for next_string in parsed_string:
+            invoked_word = False
             try:
                 if current_string == '#':
                     if previous_string == ' ' and next_string == ' ':
@@ -90,6 +187,10 @@ class SRPNCalculator:
                 elif operator := operator_map.get(current_string):  # User inputted a mathematical symbol.
                     self._operator_stack.push(operator)
 
+                elif word := self._words.get(current_string):  # User inputted a word they defined earlier.
+                    self._invoke_word(word)
+                    invoked_word = True
+
                 else:  # If input reaches here, we can ignore it and make the user aware with this error.
                     raise InvalidInput(current_string)
 
@@ -99,13 +200,50 @@ class SRPNCalculator:
                 print(e)
             finally:
                 # End of each element, check if conditions are right to run the operator chain.
-                if len(self._operator_stack) > 0 and next_string in (' ', 'd'):
+                # A word has already done this itself, as the end of its body is followed by the same next_string.
+                if len(self._operator_stack) > 0 and next_string in (' ', 'd') and not invoked_word:
                     self._execute_operator_stack()
 
                 # Update variables for the next iteration.
                 previous_string = current_string
                 current_string = next_string
 
+    def _invoke_word(self, word: Word) -> None:
+        """Executes the compiled instructions of a user-defined word.
+        The stack is checked once up front, against the word's stack effect. Should the word be able to underflow or
+        overflow the stack, its elements are instead processed one by one, so the user sees the usual errors.
+        """
+        stack = self._stack
+        if (len(self._operator_stack) > 0 or stack.count < word.required_depth
+                or stack.max_size - stack.count < word.required_space):
+            # The white space before the word has already been processed, so start from the first element of the body.
+            self._process_parsed_string(StringStack(word.elements[1:]))
+            return
+
+        for opcode, operand in word.instructions:
+            if opcode == PUSH:
+                stack.push_unchecked(operand)
+
+            elif opcode == OPERATE:
+                n2 = stack.pop_unchecked()
+                n1 = stack.pop_unchecked()
+                try:
+                    stack.push_unchecked(operand(n1, n2))
+                except OperatorException as e:
+                    print(e)
+                    stack.push_unchecked(n1)
+                    stack.push_unchecked(n2)
+
+            elif opcode == PRINT:
+                print(stack.peek())
+
+            elif opcode == RANDOM:
+                stack.push_unchecked(self._rng.next())
+
+            elif opcode == DISPLAY:
+                for item in stack.show():
+                    print(item)
+
     def _execute_operator_stack(self) -> None:
         """Sorts and executes the operator stack.
         """
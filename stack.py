@@ -12,6 +12,19 @@ from exceptions import (
     StackEmpty
 )
 
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF  # Keeps the stack state hash within 64 bits.
+
+
+def _zobrist_key(position: int, value: int) -> int:
+    """Returns a pseudo-random 64 bit key for a value held at a given position in the stack.
+    Values span the whole integer range, so rather than a pre-generated table of keys, the (position, value) pair is
+    mixed with the splitmix64 finaliser. XOR-ing these keys together gives a hash that can be updated incrementally.
+    """
+    x = (position * 0x9E3779B97F4A7C15 + (value & 0xFFFFFFFF)) & _HASH_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _HASH_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _HASH_MASK
+    return x ^ (x >> 31)
+
 
 class ABCStack(abc.ABC):
     """Represents the abstract data type: stack.
@@ -172,6 +185,138 @@ class ClampedIntStack(ABCStack):
 
         return self._values
 
+    def push_unchecked(self, value: ClampedInt) -> None:
+        """Same functionality as `push`, but without the type and size checks.
+        Only for callers which have already ensured the stack has room, such as compiled user-defined words.
+        """
+        self._values.append(value)
+
+    def pop_unchecked(self) -> ClampedInt:
+        """Same functionality as `pop`, but without checking the stack is empty first.
+        Only for callers which have already ensured the stack is deep enough, such as compiled user-defined words.
+        """
+        return self._values.pop()
+
+
+class HashedClampedIntStack(ClampedIntStack):
+    """Represents a stack of ClampedInts which keeps an incremental (Zobrist-style) hash of its contents.
+    A hash of every prefix of the stack is kept, so the hash of the values above any depth is found without rehashing.
+    From a call to `mark`, the stack also records the lowest depth read or changed and the original values above it,
+    so callers can identify and verify just the part of the stack an operation touched.
+    """
+    def __init__(self, values: typing.Iterable[ClampedInt] = None, max_size: int = None) -> None:
+        # These must exist before the parent class pushes any initial values.
+        self._prefix_hashes = [0]  # The hash of the bottom i values is held at index i.
+        self._low_water = 0  # The lowest depth read or changed since the last mark.
+        self._touched = []  # Values the stack held above the low water mark when marked, top first.
+        self._mark_hash = 0  # The state hash when marked.
+        super().__init__(values=values, max_size=max_size)
+        self.mark()
+
+    @property
+    def state_hash(self) -> int:
+        """Returns a 64 bit hash of the values currently in the stack and their positions.
+        Equal stacks always have equal hashes, but equal hashes do not guarantee equal stacks.
+        """
+        return self._prefix_hashes[-1]
+
+    @property
+    def low_water(self) -> int:
+        """Returns the lowest depth read or changed since the last mark. Values below it haven't been touched."""
+        return self._low_water
+
+    @property
+    def touched(self) -> typing.Tuple[ClampedInt, ...]:
+        """Returns the values the stack held above the low water mark when marked, from bottom to top."""
+        return tuple(reversed(self._touched))
+
+    @property
+    def touched_hash(self) -> int:
+        """Returns the hash of `touched`, as `suffix_hash` would have returned for it when marked."""
+        return self._mark_hash ^ self._prefix_hashes[self._low_water]
+
+    def mark(self) -> None:
+        """Starts recording which part of the stack is touched from now on. See `low_water` and `touched`."""
+        self._low_water = self.count
+        self._touched = []
+        self._mark_hash = self.state_hash
+
+    def suffix(self, depth: int) -> typing.Tuple[ClampedInt, ...]:
+        """Returns the values above the given depth, from bottom to top."""
+        return tuple(self._values[depth:])
+
+    def suffix_hash(self, depth: int) -> int:
+        """Returns the hash of the values above the given depth, and their positions."""
+        return self._prefix_hashes[-1] ^ self._prefix_hashes[depth]
+
+    def truncate(self, depth: int) -> None:
+        """Removes all values above the given depth."""
+        self._touch(depth)
+        del self._values[depth:]
+        del self._prefix_hashes[depth + 1:]
+
+    def clear(self) -> None:
+        """Remove all items from the stack."""
+        self.truncate(0)
+
+    def show(self) -> typing.List[ClampedInt]:
+        """Returns a list of values contained in the Stack."""
+        self._touch(0)
+        return super().show()
+
+    def peek(self) -> ClampedInt:
+        """Returns the top value from the stack
+        Raises `StackEmpty` if the stack is empty.
+        """
+        if not self.is_empty:
+            self._touch(self.count - 1)
+        return super().peek()
+
+    def peek_many(self, n: int) -> typing.List[ClampedInt]:
+        """Same functionality as `peek`, but for multiple values. Maintains their order."""
+        if 0 < n <= self.count:
+            self._touch(self.count - n)
+        return super().peek_many(n)
+
+    def push(self, value: ClampedInt) -> None:
+        """Push a single value to the top of the stack, updating the state hash."""
+        super().push(value)
+        self._prefix_hashes.append(self._prefix_hashes[-1] ^ _zobrist_key(self.count - 1, value.value))
+
+    def pop(self, index: int = -1) -> ClampedInt:
+        """Removes and returns a single value from the stack, updating the state hash.
+        Popping from anywhere other than the top shifts the positions of the values above it, so they are rehashed.
+        """
+        if self.is_empty:
+            return super().pop(index)  # Raises `StackUnderflow`.
+
+        position = index if index >= 0 else self.count + index
+        self._touch(position)
+        value = super().pop(index)
+        del self._prefix_hashes[position + 1:]
+        for i in range(position, self.count):
+            self._prefix_hashes.append(self._prefix_hashes[-1] ^ _zobrist_key(i, self._values[i].value))
+        return value
+
+    def push_unchecked(self, value: ClampedInt) -> None:
+        """Same functionality as `ClampedIntStack.push_unchecked`, but also updates the prefix hashes."""
+        self._prefix_hashes.append(self._prefix_hashes[-1] ^ _zobrist_key(len(self._values), value.value))
+        self._values.append(value)
+
+    def pop_unchecked(self) -> ClampedInt:
+        """Same functionality as `ClampedIntStack.pop_unchecked`, but also updates the prefix hashes and records the
+        popped value as touched.
+        """
+        self._touch(len(self._values) - 1)
+        self._prefix_hashes.pop()
+        return self._values.pop()
+
+    def _touch(self, depth: int) -> None:
+        """Lowers the low water mark to the given depth, first recording the original values this exposes."""
+        if depth < self._low_water:
+            self._touched.extend(reversed(self._values[depth:self._low_water]))
+            self._low_water = depth
+
 
 class StringStack(ABCStack):
     """Used to represent a stack of strings."""
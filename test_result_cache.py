@@ -0,0 +1,49 @@
+import pytest
+
+from result_cache import CachedResult, CalculatorState, ResultCache
+
+
+def cached_result(line):
+    state = CalculatorState(depth=0, stack=(), rng_index=0, is_commenting=False)
+    return CachedResult(line=line, before=state, stack_hash=0, after=state, output='')
+
+
+def test_get_stored_result():
+    cache = ResultCache()
+    result = cached_result('1 2 +')
+    cache.put(1, result)
+    assert cache.get(1, '1 2 +') is result
+
+
+def test_get_missing_result():
+    assert ResultCache().get(1, '1 2 +') is None
+
+
+def test_get_different_line_under_same_key():
+    cache = ResultCache()
+    cache.put(1, cached_result('1 2 +'))
+    assert cache.get(1, '1 2 -') is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.put(1, cached_result('1'))
+    cache.put(2, cached_result('2'))
+    cache.get(1, '1')  # 2 is now the least recently used.
+    cache.put(3, cached_result('3'))
+    assert len(cache) == 2
+    assert cache.get(2, '2') is None
+    assert cache.get(1, '1') is not None
+    assert cache.get(3, '3') is not None
+
+
+def test_clear():
+    cache = ResultCache()
+    cache.put(1, cached_result('1'))
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_must_hold_an_entry():
+    with pytest.raises(ValueError):
+        ResultCache(max_entries=0)
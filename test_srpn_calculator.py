@@ -0,0 +1,44 @@
+import pytest
+
+from srpn_calculator import SRPNCalculator
+
+# Each session is a list of lines, with None standing for a call to `reset()`, along with the number of lines which
+# should be replayed from memoized results.
+sessions = {
+    'arithmetic': (['1 2 +', '=', '1 2 +', '=', '3 4 * d', '3 4 * d', '10 0 /', '10 0 /', 'd'], 0),
+    'random': (['r r +', '=', 'r r +', '=', None, 'r r +', '='], 2),
+    'comments': (['1 # 2 3', '4 # 5', '1 # 2 3', '='], 0),
+    'overflow': (['1 ' * 25, 'd', '1 ' * 25, 'd', '+ + +', '+ + +', 'd'], 1),
+    'underflow': (['+', '1 +', '+', '=', '1 +', '='], 0),
+    'words': ([': sq 2 ^ ;', '3 sq =', None, '3 sq =', ': sq 2 ^ ;', '3 sq =', '3 sq =', ': sq 3 ^ ;', '3 sq ='], 0),
+    'replay': (['5', '3 4 * % =', '3 4 * % =', '3 4 * % =', 'd'], 2),
+    'replay above untouched values': (['9 9 5', '3 4 * % =', '+', '5', '3 4 * % =', 'd'], 1),
+    'replay random number index': (['r r + =', None, 'r r + =', 'r ='], 1),
+    'replay comment flag': (['# 2', '#', '# 2', '3 =', '#', '3 ='], 2),
+    'replay across reset': (['1 2 + d', None, '1 2 + d', None, '1 2 + d'], 2),
+    'redefinition': (['5', ': m 1 ;', 'm + =', '1 -', ': m 2 ;', 'm + =', '2 -', 'm + ='], 1),
+}
+
+
+def run_session(lines, **kwargs):
+    calc = SRPNCalculator(max_stack_size=23, **kwargs)
+    for line in lines:
+        if line is None:
+            calc.reset()
+        else:
+            calc(line)
+
+
+@pytest.mark.parametrize('name', sessions)
+def test_memoized_output_matches(name, capsys, monkeypatch):
+    """Memoization should never change what the user sees."""
+    lines, expected_replays = sessions[name]
+    run_session(lines)
+    expected = capsys.readouterr().out
+
+    replays = []
+    is_in_state = SRPNCalculator._is_in_state
+    monkeypatch.setattr(SRPNCalculator, '_is_in_state', lambda *args: replays.append(is_in_state(*args)) or replays[-1])
+    run_session(lines, memo_size=8)
+    assert capsys.readouterr().out == expected
+    assert sum(replays) == expected_replays
@@ -0,0 +1,79 @@
+from clamped_int import ClampedInt
+from stack import HashedClampedIntStack
+
+
+def hashed_stack(*values):
+    return HashedClampedIntStack(values=[ClampedInt(value) for value in values])
+
+
+def assert_hashes_match(stack, *values):
+    """Checks every suffix hash of the stack against a stack freshly built from the given values."""
+    fresh = hashed_stack(*values)
+    assert stack.state_hash == fresh.state_hash
+    for depth in range(len(values) + 1):
+        assert stack.suffix_hash(depth) == fresh.suffix_hash(depth)
+
+
+def test_suffix_hash_after_push():
+    stack = hashed_stack(1, 2)
+    stack.push(ClampedInt(3))
+    assert_hashes_match(stack, 1, 2, 3)
+
+
+def test_suffix_hash_after_pop():
+    stack = hashed_stack(1, 2, 3)
+    stack.pop()
+    assert_hashes_match(stack, 1, 2)
+
+
+def test_suffix_hash_after_pop_from_bottom():
+    stack = hashed_stack(1, 2, 3)
+    stack.pop(index=0)
+    assert_hashes_match(stack, 2, 3)
+
+
+def test_suffix_hash_after_truncate():
+    stack = hashed_stack(1, 2, 3, 4)
+    stack.truncate(1)
+    assert_hashes_match(stack, 1)
+
+
+def test_suffix_hash_depends_on_position():
+    assert hashed_stack(1, 2).state_hash != hashed_stack(2, 1).state_hash
+
+
+def test_touched_after_peek():
+    stack = hashed_stack(1, 2, 3)
+    stack.mark()
+    stack.peek()
+    assert stack.low_water == 2
+    assert stack.touched == (ClampedInt(3),)
+
+
+def test_touched_after_pops_and_pushes():
+    stack = hashed_stack(1, 2, 3, 4)
+    stack.mark()
+    stack.pop_many(2)
+    stack.push(ClampedInt(9))
+    stack.peek()
+    assert stack.low_water == 2
+    assert stack.touched == (ClampedInt(3), ClampedInt(4))
+    assert stack.touched_hash == hashed_stack(1, 2, 3, 4).suffix_hash(2)
+
+
+def test_touched_after_show():
+    stack = hashed_stack(1, 2, 3)
+    stack.mark()
+    stack.pop()
+    stack.show()
+    assert stack.low_water == 0
+    assert stack.touched == (ClampedInt(1), ClampedInt(2), ClampedInt(3))
+
+
+def test_mark_forgets_touched():
+    stack = hashed_stack(1, 2, 3)
+    stack.mark()
+    stack.pop()
+    stack.mark()
+    assert stack.low_water == 2
+    assert stack.touched == ()
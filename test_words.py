@@ -0,0 +1,74 @@
+import pytest
+
+from exceptions import InvalidDefinition
+from srpn_calculator import SRPNCalculator
+from words import Word
+
+
+def run(lines, capsys, **kwargs):
+    """Returns the lines printed while entering the given lines, leaving out the welcome message."""
+    calc = SRPNCalculator(**kwargs)
+    for line in lines:
+        calc(line)
+    return capsys.readouterr().out.splitlines()[1:]
+
+
+def test_word_runs_its_body(capsys):
+    assert run([': sq 2 ^ ;', '3 sq ='], capsys) == ['9']
+
+
+def test_nested_words_use_definition_in_force(capsys):
+    assert run([': a 1 ;', ': b a a + ;', ': a 5 ;', 'b ='], capsys) == ['2']
+
+
+def test_redefined_word(capsys):
+    assert run([': sq 2 ^ ;', ': sq 3 ^ ;', '2 sq ='], capsys) == ['8']
+
+
+def test_word_within_token_is_not_a_word(capsys):
+    assert run([': sq 2 ^ ;', '3sq'], capsys) == [
+        'Unrecognised operator or operand "s".', 'Unrecognised operator or operand "q".']
+
+
+@pytest.mark.parametrize('name', ['r', 'd', '1x'])
+def test_invalid_name_raises(name):
+    with pytest.raises(InvalidDefinition):
+        Word(name, '1')
+
+
+@pytest.mark.parametrize('definition, name', [(': r 1 ;', 'r'), (': 1x 2 ;', '1x'), (': z', 'z'), (': z 1', 'z')])
+def test_invalid_definition_is_printed(definition, name, capsys):
+    assert run([definition], capsys) == [str(InvalidDefinition(name))]
+
+
+def test_invalid_body_is_printed(capsys):
+    assert run([': z 1 # ;', 'z'], capsys) == [
+        'Unrecognised operator or operand "#".', 'Unrecognised operator or operand "z".']
+
+
+# Each case is the body of the word `w`, the lines using it, the maximum stack size and whether the word's compiled
+# instructions can't be used, so its elements are processed one by one instead.
+typed_out_cases = {
+    'fits': ('1 2 + =', ['5', 'w', 'd'], None, False),
+    'chained operators': ('2 3 4 -* =', ['w'], None, False),  # Operators in a chain run in reverse order.
+    'too few values': ('+', ['1', 'w', 'd'], None, True),
+    'too little room': ('1 1 + =', ['1 1 1', 'w', 'd'], 4, True),
+    'operators left over': ('1 2 +', ['+++', 'w d'], None, True),  # Only the first of a chain fails and is dropped.
+    'failing divide': ('0 /', ['5', 'w', 'd'], None, False),
+    'failing power': ('-1 ^', ['5', 'w', 'd'], None, False),
+    'failing divide near full': ('0 /', ['1 1', 'w', 'd'], 3, True),
+}
+
+
+@pytest.mark.parametrize('name', typed_out_cases)
+def test_word_matches_typed_out_body(name, capsys, monkeypatch):
+    body, lines, max_stack_size, falls_back = typed_out_cases[name]
+    typed_out = [' '.join(body if token == 'w' else token for token in line.split(' ')) for line in lines]
+    expected = run(typed_out, capsys, max_stack_size=max_stack_size)
+
+    calls = []
+    process_parsed_string = SRPNCalculator._process_parsed_string
+    monkeypatch.setattr(SRPNCalculator, '_process_parsed_string',
+                        lambda *args: calls.append(args) or process_parsed_string(*args))
+    assert run([f': w {body} ;'] + lines, capsys, max_stack_size=max_stack_size) == expected
+    assert (len(calls) > len(lines)) == falls_back  # Falling back processes the body as a parsed string of its own.
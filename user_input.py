@@ -1,3 +1,5 @@
+import typing
+
 from stack import StringStack
 
 
@@ -10,9 +12,12 @@ class UserInput:
     ----------
     raw_input: str
         The raw string which was entered by the user into the terminal.
+    words: Optional[Container[str]]
+        Names of user-defined words. Each whitespace delimited occurrence is kept whole as a single element.
     """
-    def __init__(self, raw_input: str) -> None:
+    def __init__(self, raw_input: str, words: typing.Container[str] = ()) -> None:
         self._raw_string = raw_input  # The raw string that was entered by the user into the terminal.
+        self._words = words  # Names of user-defined words, which shouldn't be split into individual characters.
         self._parsed_stack = StringStack()  # Individual elements extracted from the raw input string.
         self.parsed = False  # Bool whether or not the raw_input has been parsed into individual elements already.
 
@@ -37,13 +42,34 @@ class UserInput:
               (which could also mean subtraction).
             - A single letter or mathematical symbol.
             - All white space represented as ' '.
+            - The name of a user-defined word, when surrounded by white space or at the start/end of the line.
         Returns the list of parsed elements.
             """
         number_construct = ''
         # We will use this variable to determine if a number is negative or if it is just a subtraction sign
         negative_val = False
+        words_defined = bool(self._words)  # If not, there is no need to look for words at all.
+        skip = 0  # The number of characters still to skip, as they belong to a word that has already been added.
         self._parsed_stack.push(' ')  # Append white space to start and end of input to make processing simpler later.
-        for next_char in self._raw_string:
+        for index, next_char in enumerate(self._raw_string):
+            if skip:
+                skip -= 1
+                continue
+
+            # Words can only start at the start of a token.
+            if words_defined and (index == 0 or self._raw_string[index - 1].isspace()):
+                word = self._word_at(index)
+                if word is not None:  # A word also denotes the end of any number in the making.
+                    if number_construct == '':
+                        if negative_val:
+                            self._parsed_stack.push('-')
+                        negative_val = False
+                    else:
+                        number_construct, negative_val = self._number_termination(number_construct, negative_val)
+                    self._parsed_stack.push(word)
+                    skip = len(word) - 1
+                    continue
+
             if next_char == '-':  # Could be a negative number or a minus.
                 if number_construct == '':  # No number in the making
                     if negative_val:
@@ -88,6 +114,17 @@ class UserInput:
         self.parsed = True
         return self._parsed_stack
 
+    def _word_at(self, index: int) -> typing.Optional[str]:
+        """Returns the user-defined word starting at this index of the raw string, if there is one.
+        The index should be the start of a token, ie. the start of the string or just after white space.
+        """
+        end = index
+        while end < len(self._raw_string) and not self._raw_string[end].isspace():
+            end += 1
+
+        chunk = self._raw_string[index:end]
+        return chunk if chunk in self._words else None
+
     def _number_termination(self, number_construct: str, negative_val: bool) -> tuple:
         if negative_val:
             number_construct = '-' + number_construct
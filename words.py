@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import typing
+
+from clamped_int import ClampedInt
+from exceptions import InvalidDefinition, InvalidInput
+from user_input import UserInput
+from utility import is_digit, operator_map
+
+# Opcodes of the instructions a `Word` is compiled to.
+PUSH = 0  # Push the operand (a ClampedInt) onto the stack.
+OPERATE = 1  # Pop two values, apply the operand (a function from `operator_map`) and push the result.
+PRINT = 2  # Print the top value of the stack.
+RANDOM = 3  # Push the next 'random' number onto the stack.
+DISPLAY = 4  # Print every value on the stack.
+
+_fallible_operators = ('/', '%', '^')  # Operators which can fail and leave both of their values on the stack.
+
+
+class Word:
+    """
+    A user-defined word: a named sequence of SRPN elements, defined with `: name body ;`.
+    The body is compiled once into a flat list of instructions, with any words it uses inlined. The compiled body's
+    stack effect is analysed too, so that one depth check per invocation replaces the checks made for every element.
+
+    Parameters
+    ----------
+    name: str
+        The name used to invoke the word. Must be alphabetic and not shadow the 'r' or 'd' commands.
+    body: str
+        The SRPN input the word stands for. Comments ('#') aren't allowed.
+    words: Optional[Mapping[str, Word]]
+        Words which have already been defined, and so may be used in the body.
+
+    Attributes
+    ----------
+    elements: List[str]
+        The parsed body, with any words it uses replaced by their own elements.
+    instructions: List[Tuple[int, Any]]
+        The compiled body, as (opcode, operand) pairs.
+    required_depth: int
+        The number of values which must be on the stack for the body to run without underflowing.
+    required_space: int
+        The number of free places the stack must have for the body to run without overflowing.
+    """
+    def __init__(self, name: str, body: str, words: typing.Mapping[str, Word] = None) -> None:
+        if not name.isalpha() or name in ('r', 'd'):
+            raise InvalidDefinition(name)
+
+        self.name = name
+        self.elements = []
+        self.instructions = []
+        self.required_depth = 0
+        self.required_space = 0
+        self._compile(body, words if words else {})
+
+    def __repr__(self) -> repr:
+        """Returns the name of the word along with its compiled instructions."""
+        return repr(f"Word<{self.name}: {self.instructions}>")
+
+    def _compile(self, body: str, words: typing.Mapping[str, Word]) -> None:
+        """Parses the body, inlines any words used in it and compiles it into instructions.
+        Operators are deferred and executed in reverse order at the next white space or 'd', exactly as the
+        calculator does when processing the same elements.
+        Raises `InvalidInput` should the body contain anything the calculator wouldn't recognise.
+        """
+        for element in UserInput(body, words=words).get_parsed_input():
+            if element in words:  # Without its surrounding white space, as if the body had been typed out instead.
+                self.elements.extend(words[element].elements[1:-1])
+            else:
+                self.elements.append(element)
+
+        depth = 0  # Number of values pushed (positive) or popped (negative) so far, relative to the starting stack.
+        peak = 0
+        fallible = 0
+        pending_operators = []
+        for current_element, next_element in zip(self.elements, self.elements[1:]):
+            if current_element == ' ':
+                pass
+
+            elif is_digit(current_element):
+                self.instructions.append((PUSH, ClampedInt(int(current_element))))
+                depth += 1
+                peak = max(peak, depth)
+
+            elif current_element == '=':
+                self.instructions.append((PRINT, None))
+                self.required_depth = max(self.required_depth, 1 - depth)
+
+            elif current_element == 'r':
+                self.instructions.append((RANDOM, None))
+                depth += 1
+                peak = max(peak, depth)
+
+            elif current_element == 'd':
+                self.instructions.append((DISPLAY, None))
+
+            elif current_element in operator_map:
+                pending_operators.append(current_element)
+
+            else:
+                raise InvalidInput(current_element)
+
+            if pending_operators and next_element in (' ', 'd'):
+                for symbol in reversed(pending_operators):
+                    self.instructions.append((OPERATE, operator_map[symbol]))
+                    self.required_depth = max(self.required_depth, 2 - depth)
+                    depth -= 1
+                    if symbol in _fallible_operators:
+                        fallible += 1
+                pending_operators = []
+
+        # Each failed operator leaves one more value on the stack than expected, for the rest of the body.
+        self.required_space = peak + fallible